@@ -9,15 +9,50 @@ This agent uses the Claude Code SDK to analyze GitHub issues and:
 """
 
 import asyncio
+import contextvars
+import functools
 import json
 import os
-from typing import Any, Callable
+import sys
+import urllib.request
+from typing import Any, Callable, Literal
 
 from dotenv import load_dotenv
 from claude_code_sdk import ClaudeCodeOptions, ClaudeSDKClient
 
 load_dotenv()
 
+# Environment is read once at import (after .env is loaded); None means unset
+_DEFAULT_OWNER, _DEFAULT_REPO, _GH_TOKEN, _DB_URL, _GITHUB_MCP_URL, _POSTGRES_MCP_URL = (
+    os.getenv(key)
+    for key in (
+        "GITHUB_OWNER", "GITHUB_REPO", "GITHUB_TOKEN", "DATABASE_URL",
+        "GITHUB_MCP_URL", "POSTGRES_MCP_URL",
+    )
+)
+_CWD = os.path.dirname(os.path.abspath(__file__))
+
+# Duplicate candidates reported per issue in bulk retriage
+MAX_DUPLICATES = 5
+
+# Issues triaged on one agent client in bulk retriage before it is reopened.
+# A client is one CLI conversation, so this bounds how much earlier issues'
+# context (and cost) each triage carries.
+MAX_ISSUES_PER_CLIENT = 5
+
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+
+# All open issues in one paginated query instead of a REST call per issue
+OPEN_ISSUES_QUERY = """
+query($owner: String!, $repo: String!, $cursor: String) {
+  repository(owner: $owner, name: $repo) {
+    issues(states: OPEN, first: 100, after: $cursor) {
+      pageInfo { hasNextPage endCursor }
+      nodes { number title body }
+    }
+  }
+}"""
+
 
 def get_activity_text(msg) -> str | None:
     """Extract activity text from a message for logging"""
@@ -35,61 +70,78 @@ def get_activity_text(msg) -> str | None:
     return None
 
 
+# Activity lines waiting to be written by the current query's console writer.
+# Each _run_query creates its own queue so it is bound to the running loop.
+_activity_queue: contextvars.ContextVar[asyncio.Queue[str] | None] = contextvars.ContextVar(
+    "_activity_queue", default=None
+)
+
+
 def print_activity(msg) -> None:
-    """Print activity to console"""
+    """Queue activity for the console writer, which batches lines into fewer writes"""
     activity = get_activity_text(msg)
-    if activity:
+    if not activity:
+        return
+    queue = _activity_queue.get()
+    if queue is None:
         print(activity)
+    else:
+        queue.put_nowait(activity)
 
 
-async def triage_issue(
-    issue_number: int = None,
-    owner: str = None,
-    repo: str = None,
-    activity_handler: Callable[[Any], None] = print_activity,
-) -> tuple[str | None, list]:
-    """
-    Triage a GitHub issue using the Claude Code SDK.
+def _flush_activity(queue: asyncio.Queue[str], *lines: str) -> None:
+    """Write lines plus every queued activity line in one write"""
+    lines = list(lines)
+    while not queue.empty():
+        lines.append(queue.get_nowait())
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
 
-    Args:
-        issue_number: GitHub issue number to triage
-        owner: Repository owner (defaults to env var GITHUB_OWNER)
-        repo: Repository name (defaults to env var GITHUB_REPO)
-        activity_handler: Callback for activity updates
 
-    Returns:
-        Tuple of (result_text, messages)
+async def _write_activity(queue: asyncio.Queue[str]) -> None:
     """
+    Background task that writes queued activity in batches.
 
-    # Get repo info from environment if not provided
-    owner = owner or os.getenv("GITHUB_OWNER", "your-org")
-    repo = repo or os.getenv("GITHUB_REPO", "your-repo")
-
-    # MCP server configurations
-    mcp_servers = {
-        "github": {
-            "command": "docker",
-            "args": [
-                "run", "-i", "--rm",
-                "-e", "GITHUB_PERSONAL_ACCESS_TOKEN",
-                "ghcr.io/github/github-mcp-server"
-            ],
-            "env": {
-                "GITHUB_PERSONAL_ACCESS_TOKEN": os.getenv("GITHUB_TOKEN")
-            }
-        },
-        "postgres": {
-            "command": "npx",
-            "args": [
-                "-y",
-                "mcp-postgres-full-access",
-                os.getenv("DATABASE_URL")
-            ]
-        }
-    }
-
-    # System prompt for the triage agent
-    system_prompt = """You are an Issue Triage Bot with PERSISTENT MEMORY for GitHub repositories.
+    Lines that arrive while it waits are written together; the write itself
+    still runs synchronously on the event loop.
+    """
+    while True:
+        _flush_activity(queue, await queue.get())
+
+
+def fetch_open_issues(owner: str, repo: str) -> list[dict]:
+    """Fetch number, title and body of every open issue via GitHub GraphQL"""
+    issues = []
+    cursor = None
+
+    while True:
+        payload = json.dumps({
+            "query": OPEN_ISSUES_QUERY,
+            "variables": {"owner": owner, "repo": repo, "cursor": cursor},
+        }).encode()
+        request = urllib.request.Request(
+            GITHUB_GRAPHQL_URL,
+            data=payload,
+            headers={
+                "Authorization": f"Bearer {_GH_TOKEN}",
+                "Content-Type": "application/json",
+            },
+        )
+        with urllib.request.urlopen(request) as response:
+            data = json.load(response)
+
+        if data.get("errors"):
+            raise RuntimeError(f"GitHub GraphQL error: {data['errors'][0]['message']}")
+
+        page = data["data"]["repository"]["issues"]
+        issues.extend(page["nodes"])
+        if not page["pageInfo"]["hasNextPage"]:
+            return issues
+        cursor = page["pageInfo"]["endCursor"]
+
+
+SYSTEM_PROMPT = """You are an Issue Triage Bot with PERSISTENT MEMORY for GitHub repositories.
 
 Your responsibilities:
 1. Analyze issue content (title and body)
@@ -110,29 +162,254 @@ You have access to TWO MCP servers:
 
 You also have access to Python scripts via Bash:
 - scripts/issue_classifier.py: Classify issue into categories
-- scripts/memory_manager.py: Generate embeddings for storage
+- scripts/minhash_filter.py: Fast near-duplicate check (copy-pasted/lightly edited issues)
+  - check <issue_num> "title" "body" <owner/repo>: returns older near-duplicate issue numbers
+- scripts/memory_manager.py: Generate embeddings and store issues in memory
+  - store <issue_num> "title" "body" <owner/repo>: embeds and writes the row to
+    issue_embeddings directly (bulk COPY path) - no SQL INSERT needed
 
 IMPORTANT WORKFLOW:
 1. Fetch issue from GitHub MCP
-2. Search memory: query_database("SELECT * FROM find_similar_issues(...)")
-3. If duplicates found (similarity > 0.85): Flag and comment
-4. Classify and assess priority
-5. Store in memory: insert_into_database("INSERT INTO issue_embeddings...")
-6. Apply labels and post summary
+2. Pre-filter: run scripts/minhash_filter.py check ... If it returns duplicates,
+   flag them and SKIP step 3 (no embedding search needed)
+3. Search memory: query_database("SELECT * FROM find_similar_issues(...)")
+4. If duplicates found (similarity > 0.85): Flag and comment
+5. Classify and assess priority
+6. Store in memory: run scripts/memory_manager.py store ... (only fall back to
+   INSERT INTO issue_embeddings if it reports "stored": false)
+7. Apply labels and post summary
 
 Always leverage memory to provide context-aware triage!"""
 
+# System prompt for fast mode (no memory, GitHub MCP only)
+FAST_SYSTEM_PROMPT = """You are an Issue Triage Bot for GitHub repositories.
+
+Your responsibilities:
+1. Analyze issue content (title and body)
+2. Classify and label issues (bug, feature, docs, question, etc.)
+3. Assess priority (P0-critical, P1-high, P2-medium, P3-low)
+4. Estimate complexity (simple, medium, complex)
+5. Suggest appropriate assignees based on code ownership
+6. Request missing information if needed
+
+You have access to the GitHub MCP server: Fetch/label issues, post comments, read CODEOWNERS
+
+You also have access to Python scripts via Bash:
+- scripts/issue_classifier.py: Classify issue into categories
+
+WORKFLOW:
+1. Fetch issue from GitHub MCP
+2. Classify and assess priority
+3. Apply labels and post summary"""
+
+Mode = Literal["fast", "memory"]
+
+# Per-mode settings: fast trades duplicate detection for speed and cost
+MODES = {
+    "fast": {
+        "model": "claude-3-5-haiku-20241022",
+        "mcp_servers": ("github",),
+        "system_prompt": FAST_SYSTEM_PROMPT,
+    },
+    "memory": {
+        "model": "claude-sonnet-4-20250514",
+        "mcp_servers": ("github", "postgres"),
+        "system_prompt": SYSTEM_PROMPT,
+    },
+}
+
+
+@functools.cache
+def _make_mcp_servers() -> dict:
+    """
+    MCP server configurations.
+
+    By default each agent session launches its own servers (docker / npx).
+    Set GITHUB_MCP_URL or POSTGRES_MCP_URL to connect to an already-running
+    server instead and skip that startup cost on every session.
+    """
+    if _GITHUB_MCP_URL:
+        github = {
+            "type": "http",
+            "url": _GITHUB_MCP_URL,
+            "headers": {"Authorization": f"Bearer {_GH_TOKEN}"},
+        }
+    else:
+        github = {
+            "command": "docker",
+            "args": [
+                "run", "-i", "--rm",
+                "-e", "GITHUB_PERSONAL_ACCESS_TOKEN",
+                "ghcr.io/github/github-mcp-server"
+            ],
+            "env": {
+                "GITHUB_PERSONAL_ACCESS_TOKEN": _GH_TOKEN
+            }
+        }
+
+    if _POSTGRES_MCP_URL:
+        postgres = {"type": "sse", "url": _POSTGRES_MCP_URL}
+    else:
+        postgres = {
+            "command": "npx",
+            "args": [
+                "-y",
+                "mcp-postgres-full-access",
+                _DB_URL
+            ]
+        }
+
+    return {"github": github, "postgres": postgres}
+
+
+def build_options(mode: Mode = "memory") -> ClaudeCodeOptions:
+    """Build the agent options (model, tools and MCP servers) for a triage mode"""
+    settings = MODES[mode]
+    mcp_servers = _make_mcp_servers()
+
+    return ClaudeCodeOptions(
+        model=settings["model"],
+        allowed_tools=[
+            *(f"mcp__{name}" for name in settings["mcp_servers"]),  # GitHub / PostgreSQL (MEMORY)
+            "Bash",           # Run classification scripts
+            "Read",           # Read configuration files
+        ],
+        mcp_servers={name: mcp_servers[name] for name in settings["mcp_servers"]},
+        system_prompt=settings["system_prompt"],
+        cwd=_CWD,
+    )
+
+
+async def _run_query(
+    agent: ClaudeSDKClient,
+    prompt: str,
+    activity_handler: Callable[[Any], None],
+    session_id: str,
+    collect_messages: bool,
+) -> tuple[str | None, list]:
+    """
+    Send one prompt to an open agent session and stream its response.
+
+    Messages are handled as they arrive and only kept when collect_messages
+    is set, so long tool-use runs don't accumulate in memory.
+    """
+    result = None
+    messages = []
+    queue: asyncio.Queue[str] = asyncio.Queue()
+    token = _activity_queue.set(queue)
+    writer = asyncio.create_task(_write_activity(queue))
+
+    try:
+        await agent.query(prompt=prompt, session_id=session_id)
+        async for msg in agent.receive_response():
+            if collect_messages:
+                messages.append(msg)
+
+            if asyncio.iscoroutinefunction(activity_handler):
+                await activity_handler(msg)
+            else:
+                activity_handler(msg)
+
+            if hasattr(msg, "result"):
+                result = msg.result
+    finally:
+        writer.cancel()
+        _activity_queue.reset(token)
+        _flush_activity(queue)
+
+    return result, messages
+
+
+async def triage_issue(
+    issue_number: int = None,
+    owner: str = None,
+    repo: str = None,
+    activity_handler: Callable[[Any], None] = print_activity,
+    duplicates: list[dict] | None = None,
+    agent: ClaudeSDKClient | None = None,
+    collect_messages: bool = False,
+    mode: Mode = "memory",
+) -> tuple[str | None, list]:
+    """
+    Triage a GitHub issue using the Claude Code SDK.
+
+    Args:
+        issue_number: GitHub issue number to triage
+        owner: Repository owner (defaults to env var GITHUB_OWNER)
+        repo: Repository name (defaults to env var GITHUB_REPO)
+        activity_handler: Callback for activity updates
+        duplicates: Precomputed memory matches. When given, the issue is
+            already stored in memory and the agent skips the memory steps.
+        agent: Open client to reuse (bulk runs). A new client is started
+            and closed for this call when omitted.
+        collect_messages: Keep the full message trace (off by default)
+        mode: "memory" (duplicate detection) or "fast" (no memory, Haiku).
+            Must match the options of a reused agent.
+
+    Returns:
+        Tuple of (result_text, messages); messages is empty unless
+        collect_messages is set
+    """
+
+    # Get repo info from environment if not provided
+    owner = owner or _DEFAULT_OWNER or "your-org"
+    repo = repo or _DEFAULT_REPO or "your-repo"
+
+    # Tags the issue's messages; a shared client still shares one CLI
+    # conversation, so callers bound reuse (see MAX_ISSUES_PER_CLIENT)
+    session_id = f"issue-{issue_number}" if issue_number else "default"
+
     # Build query based on whether issue_number provided
-    if issue_number:
+    if issue_number and mode == "fast":
+        prompt = f"""Triage issue #{issue_number} in {owner}/{repo}.
+
+Steps:
+1. Fetch the issue details using GitHub MCP
+2. Run classification script to determine labels
+3. Assess priority level
+4. Suggest assignee if applicable
+5. Apply labels and post a summary comment
+
+Provide a structured summary showing:
+- Labels applied
+- Priority assigned"""
+    elif issue_number and duplicates is not None:
+        if duplicates:
+            memory_results = "\n".join(
+                f"- #{d['issue_number']} (similarity {d['similarity']:.2f})" for d in duplicates
+            )
+        else:
+            memory_results = "- No similar issues found"
+
+        prompt = f"""Triage issue #{issue_number} in {owner}/{repo}.
+
+Memory has ALREADY been checked and this issue is ALREADY stored - do not
+query or insert into PostgreSQL. Similar past issues (>85% = duplicate):
+{memory_results}
+
+Steps:
+1. Fetch the issue details using GitHub MCP
+2. Run classification script to determine labels
+3. Assess priority level
+4. If duplicates listed above: Flag in comment
+5. Suggest assignee if applicable
+6. Apply labels and post a summary comment
+
+Provide a structured summary showing:
+- Labels applied
+- Priority assigned
+- Memory check results (duplicates found or not)"""
+    elif issue_number:
         prompt = f"""Triage issue #{issue_number} in {owner}/{repo} using PERSISTENT MEMORY.
 
 Steps:
 1. Fetch the issue details using GitHub MCP
-2. **CHECK MEMORY**: Query PostgreSQL for similar past issues (use find_similar_issues function)
+2. **CHECK MEMORY**: Run scripts/minhash_filter.py check first; only if it finds
+   no near-duplicates, query PostgreSQL for similar past issues (use find_similar_issues function)
 3. Run classification script to determine labels
 4. Assess priority level
 5. If duplicates found (>85% similarity): Flag in comment
-6. **STORE IN MEMORY**: Insert issue embedding into PostgreSQL database
+6. **STORE**: Run scripts/memory_manager.py store {issue_number} "<title>" "<body>" {owner}/{repo}
 7. Suggest assignee if applicable
 8. Apply labels and post a summary comment (mention if duplicate was found in memory)
 
@@ -152,57 +429,152 @@ To triage an issue, call me with:
 
 Example: triage_issue(issue_number=123, owner='acme', repo='app')"""
 
-    options = ClaudeCodeOptions(
-        model="claude-sonnet-4-20250514",
-        allowed_tools=[
-            "mcp__github",    # GitHub API access
-            "mcp__postgres",  # PostgreSQL database (MEMORY)
-            "Bash",           # Run classification scripts
-            "Read",           # Read configuration files
-        ],
-        mcp_servers=mcp_servers,
-        system_prompt=system_prompt,
-        cwd=os.path.dirname(os.path.abspath(__file__)),
+    try:
+        if agent is not None:
+            return await _run_query(
+                agent, prompt, activity_handler, session_id, collect_messages
+            )
+        async with ClaudeSDKClient(options=build_options(mode)) as agent:
+            return await _run_query(
+                agent, prompt, activity_handler, session_id, collect_messages
+            )
+
+    except Exception as e:
+        print(f"❌ Triage error: {e}")
+        raise
+
+
+def check_memory_bulk(owner: str, repo: str, issues: list[dict]) -> list[list[dict]]:
+    """
+    Find duplicate candidates for many issues and store them in memory.
+
+    One batched embedding pass, one chunked search over stored embeddings
+    and one COPY, instead of the agent doing this per issue. The issues are
+    also added to the MinHash pre-filter so later single-issue runs see them.
+    """
+    from scripts import minhash_filter
+    from scripts.memory_manager import (
+        cached_embeddings,
+        find_batch_duplicates,
+        iter_embedding_chunks,
+        search_chunked,
+        store_embeddings,
     )
 
-    result = None
-    messages = []
+    repo_name = f"{owner}/{repo}"
+    texts = [f"{issue['title']} {issue['body'] or ''}" for issue in issues]
+    embeddings = cached_embeddings(
+        _DB_URL, texts, batch_size=64,
+        repo_name=repo_name, issue_numbers=[issue["number"] for issue in issues],
+    )
 
-    try:
-        async with ClaudeSDKClient(options=options) as agent:
-            await agent.query(prompt=prompt)
-            async for msg in agent.receive_response():
-                messages.append(msg)
+    # Search everything already in memory, streamed chunk by chunk.
+    # k + 1: an issue stored by an earlier run finds its own row.
+    chunks = iter_embedding_chunks(_DB_URL, repo_name)
+    matches = search_chunked(embeddings, chunks, k=MAX_DUPLICATES + 1)
 
-                if asyncio.iscoroutinefunction(activity_handler):
-                    await activity_handler(msg)
-                else:
-                    activity_handler(msg)
+    batch_matches = find_batch_duplicates([issue["number"] for issue in issues], embeddings)
 
-                if hasattr(msg, "result"):
-                    result = msg.result
+    # Only older issues count as originals - the same rule as find_batch_duplicates
+    for issue, issue_matches, extra in zip(issues, matches, batch_matches):
+        older = [m for m in issue_matches if m["issue_number"] < issue["number"]]
+        seen = {m["issue_number"] for m in older}
+        older.extend(m for m in extra if m["issue_number"] not in seen)
+        issue_matches[:] = sorted(older, key=lambda m: -m["similarity"])[:MAX_DUPLICATES]
 
-    except Exception as e:
-        print(f"❌ Triage error: {e}")
-        raise
+    # Loaded before storing, so the reseed only reads previously stored issues
+    lsh = minhash_filter.load_lsh(repo_name, _DB_URL)
 
-    return result, messages
+    stored = store_embeddings(_DB_URL, repo_name, issues, embeddings)
+    print(f"🧠 Stored {stored} embeddings in memory")
 
+    for issue, text in zip(issues, texts):
+        minhash_filter.insert(lsh, issue["number"], text)
+    minhash_filter.save_lsh(lsh, repo_name)
+
+    return matches
+
+
+async def retriage_all_open_issues(
+    owner: str, repo: str, max_concurrency: int = 8, mode: Mode = "memory"
+):
+    """
+    Retriage all open issues in a repository.
+
+    Issues are fetched with one GraphQL query. In memory mode, duplicate
+    detection and storage are done in bulk up front (check_memory_bulk).
+    Issues are then triaged by max_concurrency workers, each reusing an
+    agent client for up to MAX_ISSUES_PER_CLIENT issues, with their
+    duplicate candidates already in the prompt.
+    """
+    if not _GH_TOKEN:
+        print("❌ Set GITHUB_TOKEN in .env")
+        return []
+    if mode == "memory" and not _DB_URL:
+        print("❌ Set DATABASE_URL in .env")
+        return []
 
-async def retriage_all_open_issues(owner: str, repo: str):
-    """Retriage all open issues in a repository"""
     print(f"🔄 Retriaging all open issues in {owner}/{repo}...")
 
-    # TODO: Implement bulk retriaging
-    # 1. Fetch all open issues via GitHub MCP
-    # 2. For each issue, call triage_issue()
-    # 3. Track results and errors
+    issues = await asyncio.to_thread(fetch_open_issues, owner, repo)
+    if not issues:
+        print("✅ No open issues")
+        return []
+    print(f"📥 Fetched {len(issues)} open issues")
 
-    print("⚠️ Bulk retriaging not yet implemented")
-    print("Run: uv run python agent.py --issue <number> for individual issues")
+    if mode == "memory":
+        # Embedding, search and COPY block, so keep them off the event loop
+        matches = await asyncio.to_thread(check_memory_bulk, owner, repo, issues)
+    else:
+        matches = [None] * len(issues)
+
+    queue: asyncio.Queue[tuple[dict, list[dict] | None]] = asyncio.Queue()
+    for item in zip(issues, matches):
+        queue.put_nowait(item)
+
+    options = build_options(mode)
+    outcomes = {}
+
+    async def worker() -> None:
+        # Reusing a client starts MCP servers once per batch, not once per issue.
+        # Issues share its conversation, so it is reopened after
+        # MAX_ISSUES_PER_CLIENT issues, and after a failure that can leave a
+        # response half-read.
+        while not queue.empty():
+            async with ClaudeSDKClient(options=options) as agent:
+                for _ in range(MAX_ISSUES_PER_CLIENT):
+                    if queue.empty():
+                        break
+                    issue, issue_matches = queue.get_nowait()
+                    try:
+                        outcomes[issue["number"]], _ = await triage_issue(
+                            issue_number=issue["number"],
+                            owner=owner,
+                            repo=repo,
+                            duplicates=issue_matches,
+                            agent=agent,
+                            mode=mode,
+                        )
+                    except Exception as e:
+                        outcomes[issue["number"]] = e
+                        break
+
+    # At most max_concurrency sessions run at once, to respect API rate limits
+    worker_errors = await asyncio.gather(
+        *(worker() for _ in range(min(max_concurrency, len(issues)))),
+        return_exceptions=True,
+    )
+    startup_error = next((e for e in worker_errors if isinstance(e, Exception)), None)
+    results = [
+        (issue["number"], outcomes.get(issue["number"], startup_error)) for issue in issues
+    ]
 
+    failed = sum(1 for _, result in results if isinstance(result, Exception))
+    print(f"✅ Retriaged {len(results) - failed}/{len(results)} issues")
+    return results
 
-async def main():
+
+async def main(mode: Mode = "memory"):
     """
     Main entry point for the Issue Triage Bot.
 
@@ -211,9 +583,7 @@ async def main():
         python agent.py --issue 123              # Triage issue #123
         python agent.py --retriage-all           # Retriage all open issues
     """
-    import sys
-
-    print("🤖 Issue Triage Bot")
+    print(f"🤖 Issue Triage Bot ({mode} mode)")
     print("=" * 60)
 
     if len(sys.argv) > 1:
@@ -222,19 +592,19 @@ async def main():
             try:
                 issue_idx = sys.argv.index("--issue") + 1
                 issue_num = int(sys.argv[issue_idx])
-                result, _ = await triage_issue(issue_number=issue_num)
+                result, _ = await triage_issue(issue_number=issue_num, mode=mode)
                 print(f"\n📊 Triage Result:\n{result}\n")
             except (IndexError, ValueError):
                 print("❌ Usage: python agent.py --issue <number>")
 
         elif "--retriage-all" in sys.argv:
             # Retriage all open issues
-            owner = os.getenv("GITHUB_OWNER")
-            repo = os.getenv("GITHUB_REPO")
+            owner = _DEFAULT_OWNER
+            repo = _DEFAULT_REPO
             if not owner or not repo:
                 print("❌ Set GITHUB_OWNER and GITHUB_REPO in .env")
                 return
-            await retriage_all_open_issues(owner, repo)
+            await retriage_all_open_issues(owner, repo, mode=mode)
         else:
             print("❌ Unknown option")
             print("Usage:")
@@ -242,10 +612,31 @@ async def main():
             print("  python agent.py --retriage-all")
     else:
         # No arguments - show example
-        result, _ = await triage_issue()
+        result, _ = await triage_issue(mode=mode)
         print(f"\n{result}\n")
         print("💡 Tip: Run with --issue <number> to triage a specific issue")
 
 
+def run(mode: Mode = "memory") -> None:
+    """Run the CLI on uvloop when available"""
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main(mode))
+    else:
+        # libuv-based loop: lower per-callback overhead for the MCP/HTTP traffic
+        uvloop.run(main(mode))
+
+
+def run_fast() -> None:
+    """Console entry point: triage without memory (Haiku, GitHub MCP only)"""
+    run("fast")
+
+
+def run_memory() -> None:
+    """Console entry point: triage with persistent memory and duplicate detection"""
+    run("memory")
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    run()
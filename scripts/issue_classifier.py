@@ -6,6 +6,7 @@ Uses TF-IDF and keyword matching to classify issues into categories.
 """
 
 import json
+import re
 import sys
 from pathlib import Path
 
@@ -22,6 +23,66 @@ LABELS = {
     'security': ['security', 'vulnerability', 'exploit', 'CVE']
 }
 
+# Flat lookup tables built once at import
+CAT_NAMES = tuple(LABELS)
+KEYWORD_TO_CAT = {
+    keyword.lower(): category_idx
+    for category_idx, keywords in enumerate(LABELS.values())
+    for keyword in keywords
+}
+KEYWORDS = tuple(KEYWORD_TO_CAT)
+NORM = tuple(len(keywords) for keywords in LABELS.values())
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+def _build_automaton():
+    """Compile every keyword into one Aho-Corasick automaton"""
+    automaton = ahocorasick.Automaton()
+    for keyword in KEYWORD_TO_CAT:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+
+def _build_pattern() -> re.Pattern:
+    """
+    Compile every keyword into one case-insensitive alternation.
+
+    Each keyword gets its own named group (k<index into KEYWORDS>), so hits
+    are identified by group rather than by the matched text - IGNORECASE
+    also matches variants like 'ſ' or 'İ' that don't lowercase back to ASCII.
+    The lookahead makes matches zero-width so overlapping keywords are all
+    found, matching the semantics of independent substring checks.
+    """
+    order = sorted(range(len(KEYWORDS)), key=lambda i: len(KEYWORDS[i]), reverse=True)
+    groups = "|".join(f"(?P<k{i}>{re.escape(KEYWORDS[i])})" for i in order)
+    return re.compile(f"(?=(?:{groups}))", re.IGNORECASE)
+
+
+# Both find all keywords in one linear pass over the text
+_AUTOMATON = _build_automaton() if ahocorasick else None
+_PATTERN = _build_pattern()
+
+
+def _keyword_counts(*texts: str) -> list[int]:
+    """Count distinct keywords found across texts, per category"""
+    found = set()
+    for text in texts:
+        if _AUTOMATON is None:
+            # Case-insensitive pattern - no lowercased copy of the text needed
+            found.update(KEYWORDS[int(match.lastgroup[1:])] for match in _PATTERN.finditer(text))
+        else:
+            found.update(keyword for _, keyword in _AUTOMATON.iter(text.lower()))
+
+    counts = [0] * len(CAT_NAMES)
+    for keyword in found:
+        counts[KEYWORD_TO_CAT[keyword]] += 1
+    return counts
+
 
 def classify_issue(title: str, body: str = "", min_confidence: float = 0.6) -> dict:
     """
@@ -35,28 +96,25 @@ def classify_issue(title: str, body: str = "", min_confidence: float = 0.6) -> d
     Returns:
         Dictionary with classification results
     """
-    text = f"{title} {body}".lower()
-
-    # Score each category
-    scores = {}
-    for category, keywords in LABELS.items():
-        score = sum(1 for keyword in keywords if keyword in text)
-        # Normalize by number of keywords
-        scores[category] = score / len(keywords) if keywords else 0
+    # Score each category, normalized by number of keywords.
+    # Title and body are scanned in place rather than joined into a new string.
+    scores = [
+        count / norm if norm else 0
+        for count, norm in zip(_keyword_counts(title, body), NORM)
+    ]
+    max_score = max(scores, default=0)
 
     # Get categories above threshold
-    labels = [cat for cat, score in scores.items() if score >= min_confidence]
+    labels = [cat for cat, score in zip(CAT_NAMES, scores) if score >= min_confidence]
 
     # If no labels meet threshold, pick top scoring if any matches
-    if not labels and scores:
-        max_score = max(scores.values())
-        if max_score > 0:
-            labels = [cat for cat, score in scores.items() if score == max_score]
+    if not labels and max_score > 0:
+        labels = [cat for cat, score in zip(CAT_NAMES, scores) if score == max_score]
 
     return {
         "labels": labels,
-        "scores": {k: round(v, 2) for k, v in scores.items()},
-        "confidence": round(max(scores.values()) if scores else 0, 2)
+        "scores": {cat: round(score, 2) for cat, score in zip(CAT_NAMES, scores)},
+        "confidence": round(max_score, 2)
     }
 
 
@@ -10,32 +10,470 @@ This script provides a simple interface for the agent to:
 The agent will use PostgreSQL MCP to interact with this database.
 """
 
+import hashlib
 import json
+import os
+import re
 import sys
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 
+import numpy as np
+import psycopg
+from pgvector import HalfVector
+from pgvector.psycopg import register_vector
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+try:
+    from sentence_transformers import SentenceTransformer
+    _MODEL = SentenceTransformer(MODEL_NAME)
+except Exception:  # Model or dependency unavailable - use hash-based vectors
+    _MODEL = None
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+EMBEDDING_DIM = 384
+
+# Local ANN indexes over a repository's stored issues (ids are issue numbers),
+# built from issue_embeddings by the index command
+INDEX_DIR = Path(__file__).parent.parent
+
+# Maximum SimHash Hamming distance for reusing a cached embedding
+SIMHASH_MAX_DISTANCE = 3
+
 # For local testing, we can use this script directly
 # But in production, the agent uses PostgreSQL MCP tools
 
-def generate_test_embedding(text: str, dimension: int = 384):
+def normalize(embeddings: np.ndarray) -> np.ndarray:
+    """L2-normalize embeddings row-wise so inner product equals cosine"""
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    return embeddings / (np.linalg.norm(embeddings, axis=-1, keepdims=True) + 1e-12)
+
+
+def _hash_embedding(text: str, dimension: int = EMBEDDING_DIM) -> np.ndarray:
+    """
+    Fallback embedding used when sentence-transformers is unavailable.
+
+    Deterministic but carries no semantic signal - only exact text matches
+    will score as duplicates.
+    """
+    hash_bytes = np.frombuffer(hashlib.sha256(text.encode()).digest(), dtype=np.uint8)
+    return normalize(np.resize(hash_bytes, dimension).astype(np.float32) / 255.0 * 2 - 1)
+
+
+def generate_test_embedding(text: str, dimension: int = EMBEDDING_DIM) -> np.ndarray:
+    """
+    Generate an L2-normalized embedding for issue text.
+
+    Uses all-MiniLM-L6-v2 (384 dimensions) so cosine similarity is meaningful.
+    Falls back to a hash-based vector if the model cannot be loaded.
+    """
+    if _MODEL is None:
+        return _hash_embedding(text, dimension)
+    return _MODEL.encode(text, normalize_embeddings=True).astype(np.float32)
+
+
+def generate_embeddings(texts: list[str], batch_size: int = 64) -> np.ndarray:
+    """
+    Embed many texts at once, returning an (N, 384) float32 array.
+
+    Encoding in batches keeps the transformer busy on matrix multiplies
+    instead of paying per-call overhead for every issue.
+    """
+    if _MODEL is None:
+        return np.stack([_hash_embedding(text) for text in texts])
+    return _MODEL.encode(
+        texts,
+        batch_size=batch_size,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+    ).astype(np.float32)
+
+
+def _simhash(text: str) -> int:
+    """64-bit SimHash of the words in text, as a signed BIGINT"""
+    tokens = re.findall(r"\w+", text.lower())
+    if not tokens:
+        return 0
+
+    hashes = np.array(
+        [hashlib.blake2b(token.encode(), digest_size=8).digest() for token in tokens]
+    )
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 - len(tokens)
+    return int(np.packbits(votes > 0, bitorder="little").view(np.int64)[0])
+
+
+def cached_embeddings(
+    database_url: str,
+    texts: list[str],
+    batch_size: int = 64,
+    repo_name: str | None = None,
+    issue_numbers: list[int] | None = None,
+) -> np.ndarray:
+    """
+    Embed texts, reusing vectors from emb_cache where possible.
+
+    Exact text matches are looked up by SHA-256. When the texts belong to
+    issues (repo_name and issue_numbers given), each remaining text is also
+    compared by SimHash against that same issue's previously cached texts,
+    so a minor edit reuses the issue's earlier vector. Different issues are
+    never matched this way: templated bodies make unrelated issues' SimHashes
+    nearly identical. Only model-computed vectors are added to the cache,
+    keyed by model name; hash-based fallback vectors are never read or cached.
+    """
+    if _MODEL is None:
+        return generate_embeddings(texts, batch_size)
+
+    shas = [hashlib.sha256(text.encode()).hexdigest() for text in texts]
+    numbers = issue_numbers if repo_name and issue_numbers else [None] * len(texts)
+    embeddings = np.empty((len(texts), EMBEDDING_DIM), dtype=np.float32)
+
+    with psycopg.connect(database_url) as conn:
+        register_vector(conn)
+
+        cached = dict(conn.execute(
+            "SELECT sha, embedding FROM emb_cache WHERE model = %s AND sha = ANY(%s)",
+            (MODEL_NAME, shas),
+        ).fetchall())
+
+        pending = []
+        for i, sha in enumerate(shas):
+            if sha in cached:
+                embeddings[i] = cached[sha].to_numpy()
+            else:
+                pending.append(i)
+
+        simhashes = [_simhash(texts[i]) for i in pending]
+        fuzzy = {}
+        if any(numbers[i] is not None for i in pending):
+            fuzzy = dict(conn.execute(
+                "SELECT DISTINCT ON (q.idx) q.idx, c.embedding "
+                "FROM unnest(%s::int[], %s::bigint[]) WITH ORDINALITY "
+                "AS q(issue_number, simhash, idx) "
+                "JOIN emb_cache c ON c.model = %s AND c.repo_name = %s "
+                "AND c.issue_number = q.issue_number "
+                "AND bit_count((c.simhash # q.simhash)::bit(64)) <= %s "
+                "ORDER BY q.idx, bit_count((c.simhash # q.simhash)::bit(64))",
+                (
+                    [numbers[i] for i in pending], simhashes,
+                    MODEL_NAME, repo_name, SIMHASH_MAX_DISTANCE,
+                ),
+            ).fetchall())
+
+        misses = []
+        for position, i in enumerate(pending):
+            # WITH ORDINALITY is 1-based
+            if position + 1 in fuzzy:
+                embeddings[i] = fuzzy[position + 1].to_numpy()
+            else:
+                misses.append((i, shas[i], simhashes[position]))
+
+        if misses:
+            embeddings[[i for i, _, _ in misses]] = generate_embeddings(
+                [texts[i] for i, _, _ in misses], batch_size
+            )
+
+            with conn.cursor() as cur:
+                cur.executemany(
+                    "INSERT INTO emb_cache "
+                    "(model, sha, simhash, embedding, repo_name, issue_number) "
+                    "VALUES (%s, %s, %s, %s, %s, %s) ON CONFLICT (model, sha) DO NOTHING",
+                    [
+                        (
+                            MODEL_NAME, sha, simhash, HalfVector(embeddings[i]),
+                            repo_name if numbers[i] is not None else None, numbers[i],
+                        )
+                        for i, sha, simhash in misses
+                    ],
+                )
+
+    return embeddings
+
+
+def embed_text(
+    text: str, repo_name: str | None = None, issue_number: int | None = None
+) -> np.ndarray:
+    """Embed a single text, going through emb_cache when DATABASE_URL is set"""
+    database_url = os.getenv("DATABASE_URL")
+    if database_url:
+        issue_numbers = [issue_number] if issue_number is not None else None
+        return cached_embeddings(
+            database_url, [text], repo_name=repo_name, issue_numbers=issue_numbers
+        )[0]
+    return generate_test_embedding(text)
+
+
+def format_vector(embedding: np.ndarray) -> str:
     """
-    Generate a test embedding for demonstration purposes.
-    In production, the agent will use sentence-transformers via MCP.
+    Format an embedding as a pgvector literal for SQL queries.
 
-    For demo: creates a simple hash-based vector
+    Values are rounded to half precision to match the halfvec column, which
+    also keeps the literal short when the agent passes it through MCP.
     """
-    import hashlib
-    # Create a deterministic "embedding" from text hash
-    hash_obj = hashlib.sha256(text.encode())
-    hash_bytes = hash_obj.digest()
+    return "[" + ",".join(map(str, np.asarray(embedding, dtype=np.float16))) + "]"
+
+
+def index_path(repo_name: str) -> Path:
+    """Local HNSW index file for a repository ("owner/repo")"""
+    return INDEX_DIR / f"issues-{repo_name.replace('/', '__')}.hnsw"
+
+
+def build_index(database_url: str, repo_name: str) -> int:
+    """
+    Rebuild a repository's local HNSW index from issue_embeddings.
+
+    The index is written from scratch with one vector per stored issue, so
+    re-stored (edited) issues never leave stale entries behind.
+
+    Returns:
+        Number of issues indexed
+    """
+    hnsw = faiss.IndexHNSWFlat(EMBEDDING_DIM, 32, faiss.METRIC_INNER_PRODUCT)
+    index = faiss.IndexIDMap(hnsw)
+    for numbers, embeddings in iter_embedding_chunks(database_url, repo_name, overlap=0):
+        index.add_with_ids(embeddings, numbers)
+
+    faiss.write_index(index, str(index_path(repo_name)))
+    return index.ntotal
+
+
+def load_index(repo_name: str):
+    """Load a repository's local HNSW index, or None if FAISS or the file is missing"""
+    path = index_path(repo_name)
+    return faiss.read_index(str(path)) if faiss and path.exists() else None
+
+
+def search_index_batch(
+    index, embeddings: np.ndarray, k: int = 5, threshold: float = 0.85
+) -> list[list[dict]]:
+    """Find stored issues similar to each embedding with one batched index search"""
+    similarities, ids = index.search(np.asarray(embeddings, dtype=np.float32), k)
+
+    results = []
+    for row_similarities, row_ids in zip(similarities, ids):
+        results.append([
+            {"issue_number": int(issue_number), "similarity": round(float(similarity), 4)}
+            for similarity, issue_number in zip(row_similarities, row_ids)
+            if issue_number >= 0 and similarity >= threshold
+        ])
 
-    # Convert to float array (normalized)
-    embedding = []
-    for i in range(dimension):
-        byte_val = hash_bytes[i % len(hash_bytes)]
-        embedding.append((byte_val / 255.0) * 2 - 1)  # Normalize to [-1, 1]
+    return results
 
-    return embedding
+
+def search_index(
+    index, embedding: np.ndarray, k: int = 5, threshold: float = 0.85
+) -> list[dict]:
+    """Find stored issues similar to a single embedding"""
+    return search_index_batch(index, embedding[None], k, threshold)[0]
+
+
+def similarity_matrix(queries: np.ndarray, corpus: np.ndarray) -> np.ndarray:
+    """
+    Cosine similarity between every query and every corpus embedding.
+
+    Both inputs must already be L2-normalized (see normalize()). Uses
+    SimSIMD's f16 kernels when available (half the memory traffic of
+    float32), otherwise a single BLAS matrix multiply.
+    """
+    if simsimd is not None:
+        distances = simsimd.cdist(
+            queries.astype(np.float16), corpus.astype(np.float16), metric="cosine"
+        )
+        return 1.0 - np.asarray(distances, dtype=np.float32)
+
+    return queries @ corpus.T
+
+
+def iter_embedding_chunks(
+    database_url: str, repo_name: str, chunk_size: int = 5000, overlap: int = 100
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """
+    Stream a repository's stored embeddings as overlapping chunks.
+
+    Rows are read with keyset pagination on id, so only one chunk of
+    embeddings is held in memory at a time. Rows whose embedding was cleared
+    (see migration 002) are skipped until they are re-stored. Each chunk repeats the last
+    overlap rows of the previous one.
+
+    Yields:
+        (issue_numbers, embeddings) with embeddings L2-normalized float32
+    """
+    last_id = 0
+    tail_numbers = np.empty(0, dtype=np.int64)
+    tail_embeddings = np.empty((0, EMBEDDING_DIM), dtype=np.float32)
+
+    with psycopg.connect(database_url) as conn:
+        register_vector(conn)
+
+        while True:
+            limit = chunk_size - len(tail_numbers)
+            rows = conn.execute(
+                "SELECT id, issue_number, embedding FROM issue_embeddings "
+                "WHERE repo_name = %s AND id > %s AND embedding IS NOT NULL "
+                "ORDER BY id LIMIT %s",
+                (repo_name, last_id, limit),
+            ).fetchall()
+            if not rows:
+                return
+
+            last_id = rows[-1][0]
+            numbers = np.concatenate([
+                tail_numbers, np.array([row[1] for row in rows], dtype=np.int64)
+            ])
+            # Re-normalize after half-precision storage so searches are plain inner products
+            embeddings = np.concatenate([
+                tail_embeddings, normalize(np.stack([row[2].to_numpy() for row in rows]))
+            ])
+            yield numbers, embeddings
+
+            if len(rows) < limit:
+                return
+            tail_numbers = numbers[len(numbers) - overlap:]
+            tail_embeddings = embeddings[len(embeddings) - overlap:]
+
+
+def search_chunked(
+    queries: np.ndarray,
+    chunks: Iterable[tuple[np.ndarray, np.ndarray]],
+    k: int = 5,
+    threshold: float = 0.85,
+) -> list[list[dict]]:
+    """
+    Top-k search of queries against stored embeddings, one chunk at a time.
+
+    Each (issue_numbers, embeddings) chunk, e.g. from iter_embedding_chunks,
+    is searched with its own flat inner-product index, so only one chunk's
+    index exists at a time. Hits are merged by max similarity per issue.
+    """
+    best = [{} for _ in range(len(queries))]
+    queries = np.asarray(queries, dtype=np.float32)
+
+    for chunk_numbers, chunk in chunks:
+        if not len(chunk):
+            continue
+        chunk = np.ascontiguousarray(chunk, dtype=np.float32)
+
+        chunk_k = min(k, len(chunk))
+        if faiss is not None:
+            index = faiss.IndexFlatIP(chunk.shape[1])
+            index.add(chunk)
+            similarities, positions = index.search(queries, chunk_k)
+        else:
+            all_similarities = similarity_matrix(queries, chunk)
+            positions = np.argsort(-all_similarities, axis=1)[:, :chunk_k]
+            similarities = np.take_along_axis(all_similarities, positions, axis=1)
+
+        for matches, row_similarities, row_positions in zip(best, similarities, positions):
+            for similarity, position in zip(row_similarities, row_positions):
+                if position < 0 or similarity < threshold:
+                    continue
+                issue_number = int(chunk_numbers[position])
+                matches[issue_number] = max(matches.get(issue_number, -1.0), float(similarity))
+
+    return [
+        [
+            {"issue_number": num, "similarity": round(sim, 4)}
+            for num, sim in sorted(matches.items(), key=lambda item: -item[1])[:k]
+        ]
+        for matches in best
+    ]
+
+
+def find_batch_duplicates(
+    issue_numbers: list[int], embeddings: np.ndarray, threshold: float = 0.85
+) -> list[list[dict]]:
+    """
+    Find duplicates within a batch of issues that are not yet in memory.
+
+    An issue is only matched against older (lower-numbered) issues so the
+    original is never flagged as a duplicate of its copy.
+    """
+    similarities = similarity_matrix(embeddings, embeddings)
+    numbers = np.asarray(issue_numbers)
+
+    results = []
+    for i, row in enumerate(similarities):
+        candidates = np.flatnonzero((row >= threshold) & (numbers < numbers[i]))
+        candidates = candidates[np.argsort(-row[candidates])]
+        results.append([
+            {"issue_number": int(numbers[j]), "similarity": round(float(row[j]), 4)}
+            for j in candidates
+        ])
+
+    return results
+
+
+def store_embeddings(
+    database_url: str, repo_name: str, issues: list[dict], embeddings: np.ndarray
+) -> int:
+    """
+    Upsert issue embeddings into issue_embeddings in a single COPY.
+
+    Rows are streamed in binary format into a temporary table, then merged
+    with one INSERT ... ON CONFLICT so re-stored issues are updated.
+
+    Args:
+        database_url: PostgreSQL connection string
+        repo_name: Repository the issues belong to ("owner/repo")
+        issues: Dicts with number, title and body keys
+        embeddings: Array of embeddings aligned with issues
+
+    Returns:
+        Number of rows written
+    """
+    if not issues:
+        return 0
+
+    # Stored vectors must be unit length for the inner-product index
+    embeddings = normalize(embeddings)
+
+    with psycopg.connect(database_url) as conn:
+        register_vector(conn)
+        conn.execute(
+            "CREATE TEMP TABLE staged_embeddings ("
+            "issue_number INTEGER, repo_name TEXT, title TEXT, body TEXT, "
+            "embedding halfvec(384)) ON COMMIT DROP"
+        )
+
+        with conn.cursor() as cur:
+            with cur.copy(
+                "COPY staged_embeddings (issue_number, repo_name, title, body, embedding) "
+                "FROM STDIN (FORMAT BINARY)"
+            ) as copy:
+                copy.set_types(["int4", "text", "text", "text", "halfvec"])
+                for issue, embedding in zip(issues, embeddings):
+                    copy.write_row((
+                        issue["number"], repo_name, issue["title"], issue.get("body") or "",
+                        HalfVector(embedding),
+                    ))
+
+            cur.execute(
+                "INSERT INTO issue_embeddings (issue_number, repo_name, title, body, embedding) "
+                "SELECT issue_number, repo_name, title, body, embedding FROM staged_embeddings "
+                "ON CONFLICT (repo_name, issue_number) DO UPDATE SET "
+                "title = EXCLUDED.title, body = EXCLUDED.body, embedding = EXCLUDED.embedding"
+            )
+
+    return len(issues)
+
+
+def _repo_name_arg(position: int) -> str | None:
+    """owner/repo from the CLI argument at position, else from GITHUB_OWNER/GITHUB_REPO"""
+    if len(sys.argv) > position:
+        return sys.argv[position]
+    if os.getenv("GITHUB_OWNER") and os.getenv("GITHUB_REPO"):
+        return f"{os.getenv('GITHUB_OWNER')}/{os.getenv('GITHUB_REPO')}"
+    return None
 
 
 def main():
@@ -43,17 +481,23 @@ def main():
     CLI interface for memory operations.
 
     Usage:
-        python memory_manager.py store <issue_number> "<title>" "<body>"
-        python memory_manager.py search "<text>" [threshold]
+        python memory_manager.py store <issue_number> "<title>" "<body>" [owner/repo]
+        python memory_manager.py search "<text>" [threshold] [owner/repo]
+        python memory_manager.py index [owner/repo]
     """
     if len(sys.argv) < 2:
         print("""Usage:
-  Store issue:  python memory_manager.py store <issue_num> "title" "body"
-  Search:       python memory_manager.py search "text" [threshold]
+  Store issue:  python memory_manager.py store <issue_num> "title" "body" [owner/repo]
+  Search:       python memory_manager.py search "text" [threshold] [owner/repo]
+  Build index:  python memory_manager.py index [owner/repo]
+
+Search uses a local index that is only updated by the index command
+(rebuilt from issue_embeddings); it is not persisted between CI runs.
 
 Examples:
   python memory_manager.py store 1 "App crashes" "Stack trace..."
-  python memory_manager.py search "crash on submit" 0.85
+  python memory_manager.py index octo/app
+  python memory_manager.py search "crash on submit" 0.85 octo/app
 """)
         sys.exit(1)
 
@@ -67,45 +511,85 @@ Examples:
         issue_num = int(sys.argv[2])
         title = sys.argv[3]
         body = sys.argv[4]
+        repo_name = _repo_name_arg(5)
+        if not repo_name:
+            print("❌ Pass owner/repo or set GITHUB_OWNER and GITHUB_REPO in .env")
+            sys.exit(1)
 
         # Generate embedding
         text = f"{title} {body}"
-        embedding = generate_test_embedding(text)
+        embedding = embed_text(text, repo_name, issue_num)
 
         result = {
             "command": "store",
             "issue_number": issue_num,
             "title": title,
             "embedding_dimension": len(embedding),
-            "message": f"Use PostgreSQL MCP to store this embedding"
         }
 
+        database_url = os.getenv("DATABASE_URL")
+        if database_url:
+            issue = {"number": issue_num, "title": title, "body": body}
+            store_embeddings(database_url, repo_name, [issue], embedding[None])
+            result["stored"] = True
+            result["repo_name"] = repo_name
+        else:
+            result["stored"] = False
+            result["embedding"] = format_vector(embedding)
+            result["message"] = "Use PostgreSQL MCP to store this embedding"
+
         print(json.dumps(result, indent=2))
 
     elif command == "search":
         if len(sys.argv) < 3:
-            print("Usage: python memory_manager.py search 'text' [threshold]")
+            print("Usage: python memory_manager.py search 'text' [threshold] [owner/repo]")
             sys.exit(1)
 
         query_text = sys.argv[2]
         threshold = float(sys.argv[3]) if len(sys.argv) > 3 else 0.85
+        repo_name = _repo_name_arg(4)
 
         # Generate query embedding
-        embedding = generate_test_embedding(query_text)
+        embedding = embed_text(query_text)
+        index = load_index(repo_name) if repo_name else None
 
         result = {
             "command": "search",
             "query": query_text,
             "threshold": threshold,
             "embedding_dimension": len(embedding),
-            "message": "Use PostgreSQL MCP to query: SELECT * FROM find_similar_issues(...)"
+            "indexed_issues": index.ntotal if index is not None else 0,
+            "matches": (
+                search_index(index, embedding, threshold=threshold) if index is not None else []
+            ),
+            "embedding": format_vector(embedding),
+            "message": (
+                "Matches come from the local index as of its last rebuild. "
+                if index is not None
+                else "No local index for this repository (run the index command) - "
+            ) + "Use PostgreSQL MCP to query: SELECT * FROM find_similar_issues(...)",
+        }
+
+        print(json.dumps(result, indent=2))
+
+    elif command == "index":
+        repo_name = _repo_name_arg(2)
+        database_url = os.getenv("DATABASE_URL")
+        if not repo_name or not database_url or faiss is None:
+            print("❌ Needs owner/repo (or GITHUB_OWNER and GITHUB_REPO), DATABASE_URL and faiss")
+            sys.exit(1)
+
+        result = {
+            "command": "index",
+            "repo_name": repo_name,
+            "indexed_issues": build_index(database_url, repo_name),
         }
 
         print(json.dumps(result, indent=2))
 
     else:
         print(f"Unknown command: {command}")
-        print("Use 'store' or 'search'")
+        print("Use 'store', 'search' or 'index'")
         sys.exit(1)
 
 
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+MinHash Filter - Cheap near-duplicate check before semantic search
+
+Indexes issue text as MinHash signatures in an LSH index so obvious
+duplicates (copy-pasted or lightly edited issues) are found without
+running the embedding model or querying PostgreSQL.
+
+Each repository's index is persisted to its own file and updated as
+issues are checked. Issues already stored in issue_embeddings but missing
+from the index (a fresh CI checkout, or a run whose save was overwritten
+by a concurrent one) are added when the index is loaded.
+"""
+
+import json
+import os
+import pickle
+import re
+import sys
+from pathlib import Path
+
+import psycopg
+from datasketch import MinHash, MinHashLSH
+
+# Jaccard similarity over shingles above which issues are candidate duplicates
+THRESHOLD = 0.8
+NUM_PERM = 128
+SHINGLE_SIZE = 5
+
+LSH_DIR = Path(__file__).parent.parent
+
+
+def build_minhash(text: str) -> MinHash:
+    """MinHash signature of the text's character 5-shingles"""
+    text = re.sub(r"\s+", " ", text.lower()).strip()
+    shingles = {text[i:i + SHINGLE_SIZE] for i in range(max(len(text) - SHINGLE_SIZE + 1, 1))}
+
+    minhash = MinHash(num_perm=NUM_PERM)
+    minhash.update_batch([shingle.encode() for shingle in shingles])
+    return minhash
+
+
+def lsh_path(repo_name: str) -> Path:
+    """Index file for a repository ("owner/repo")"""
+    return LSH_DIR / f".minhash_lsh-{repo_name.replace('/', '__')}.pkl"
+
+
+def load_lsh(repo_name: str, database_url: str | None = None) -> MinHashLSH:
+    """
+    Load a repository's persisted LSH index, or create an empty one.
+
+    When database_url is set, the repository's issues in issue_embeddings
+    that are not in the index yet are added to it.
+    """
+    lsh = None
+    path = lsh_path(repo_name)
+    if path.exists():
+        with path.open("rb") as f:
+            saved = pickle.load(f)
+        if saved["repo_name"] == repo_name:
+            lsh = saved["lsh"]
+    if lsh is None:
+        lsh = MinHashLSH(threshold=THRESHOLD, num_perm=NUM_PERM)
+
+    if database_url:
+        with psycopg.connect(database_url) as conn:
+            rows = conn.execute(
+                "SELECT issue_number, title, body FROM issue_embeddings "
+                "WHERE repo_name = %s AND NOT (issue_number = ANY(%s))",
+                (repo_name, list(lsh.keys)),
+            )
+            for issue_number, title, body in rows:
+                insert(lsh, issue_number, f"{title} {body or ''}")
+    return lsh
+
+
+def save_lsh(lsh: MinHashLSH, repo_name: str) -> None:
+    """Persist a repository's LSH index to disk"""
+    with lsh_path(repo_name).open("wb") as f:
+        pickle.dump({"repo_name": repo_name, "lsh": lsh}, f)
+
+
+def insert(lsh: MinHashLSH, issue_number: int, text: str, minhash: MinHash | None = None) -> None:
+    """Add an issue to the index, replacing its previous signature if any"""
+    if issue_number in lsh:
+        lsh.remove(issue_number)
+    lsh.insert(issue_number, minhash or build_minhash(text))
+
+
+def check_and_insert(lsh: MinHashLSH, issue_number: int, text: str) -> list[int]:
+    """
+    Find candidate duplicates of an issue, then add it to the index.
+
+    Only older (lower-numbered) issues are returned, so the original is
+    never reported as a duplicate of its copy. Re-checking an edited issue
+    replaces its previous signature.
+    """
+    minhash = build_minhash(text)
+    candidates = sorted(key for key in lsh.query(minhash) if key < issue_number)
+    insert(lsh, issue_number, text, minhash)
+    return candidates
+
+
+def main():
+    """
+    CLI interface for the MinHash pre-filter.
+
+    Usage:
+        python minhash_filter.py check <issue_number> "<title>" "<body>" [owner/repo]
+    """
+    if len(sys.argv) < 4 or sys.argv[1] != "check":
+        print("""Usage:
+  Check issue:  python minhash_filter.py check <issue_num> "title" ["body"] [owner/repo]
+
+Example:
+  python minhash_filter.py check 12 "App crashes" "Stack trace..." octo/app
+""")
+        sys.exit(1)
+
+    issue_num = int(sys.argv[2])
+    title = sys.argv[3]
+    body = sys.argv[4] if len(sys.argv) > 4 else ""
+    if len(sys.argv) > 5:
+        repo_name = sys.argv[5]
+    elif os.getenv("GITHUB_OWNER") and os.getenv("GITHUB_REPO"):
+        repo_name = f"{os.getenv('GITHUB_OWNER')}/{os.getenv('GITHUB_REPO')}"
+    else:
+        print("❌ Pass owner/repo or set GITHUB_OWNER and GITHUB_REPO in .env")
+        sys.exit(1)
+
+    lsh = load_lsh(repo_name, os.getenv("DATABASE_URL"))
+    duplicates = check_and_insert(lsh, issue_num, f"{title} {body}")
+    save_lsh(lsh, repo_name)
+
+    result = {
+        "command": "check",
+        "issue_number": issue_num,
+        "repo_name": repo_name,
+        "duplicates": duplicates,
+        "message": (
+            "Near-duplicate found - flag it and skip the embedding search"
+            if duplicates
+            else "No near-duplicates - continue with memory search"
+        ),
+    }
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+-- Store embeddings as half precision and search them with HNSW (requires pgvector >= 0.7)
+--
+-- Embeddings are L2-normalized before insert, so inner product equals cosine
+-- similarity and the cheaper inner-product operator can be used.
+
+-- The ivfflat index is tied to the vector column type
+DROP INDEX IF EXISTS issue_embeddings_embedding_idx;
+
+-- Existing rows hold the old SHA-256 pseudo-embeddings: not unit length (so
+-- they would dominate inner-product ranking) and not comparable with model
+-- embeddings. Clear them; they are re-embedded the next time each issue is
+-- stored (e.g. by `agent.py --retriage-all`).
+UPDATE issue_embeddings SET embedding = NULL WHERE embedding IS NOT NULL;
+
+-- Half precision halves the bytes read per comparison
+ALTER TABLE issue_embeddings
+ALTER COLUMN embedding TYPE halfvec(384);
+
+-- HNSW index on inner product
+CREATE INDEX IF NOT EXISTS issue_embeddings_embedding_idx
+ON issue_embeddings
+USING hnsw (embedding halfvec_ip_ops)
+WITH (m = 16, ef_construction = 64);
+
+-- Replace the vector(384) signature from 001
+DROP FUNCTION IF EXISTS find_similar_issues(vector, FLOAT, INT);
+
+-- Function to find similar issues using inner product (<#> is the negative inner product)
+CREATE OR REPLACE FUNCTION find_similar_issues(
+    query_embedding halfvec(384),
+    similarity_threshold FLOAT DEFAULT 0.85,
+    max_results INT DEFAULT 5
+)
+RETURNS TABLE (
+    issue_number INTEGER,
+    repo_name TEXT,
+    title TEXT,
+    similarity FLOAT
+) AS $$
+BEGIN
+    -- ORDER BY ... LIMIT lets the planner use the HNSW index; filter afterwards
+    RETURN QUERY
+    SELECT nearest.issue_number, nearest.repo_name, nearest.title, nearest.similarity
+    FROM (
+        SELECT
+            ie.issue_number,
+            ie.repo_name,
+            ie.title,
+            -(ie.embedding <#> query_embedding)::FLOAT as similarity
+        FROM issue_embeddings ie
+        WHERE ie.embedding IS NOT NULL
+        ORDER BY ie.embedding <#> query_embedding
+        LIMIT max_results
+    ) nearest
+    WHERE nearest.similarity >= similarity_threshold;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,25 @@
+-- Cache of computed embeddings keyed by embedding model and text content
+--
+-- Lets re-runs and lightly edited issues reuse a previous embedding instead
+-- of running the model again:
+--   model        - embedding model that produced the vector
+--   sha          - SHA-256 of the exact text (exact hit)
+--   simhash      - 64-bit SimHash of the text's words (fuzzy hit by Hamming distance)
+--   repo_name,
+--   issue_number - issue the text belonged to; fuzzy hits are only taken from
+--                  earlier texts of the same issue (NULL for non-issue text)
+CREATE TABLE IF NOT EXISTS emb_cache (
+    model TEXT NOT NULL,
+    sha TEXT NOT NULL,
+    simhash BIGINT NOT NULL,
+    embedding halfvec(384) NOT NULL,
+    repo_name TEXT,
+    issue_number INTEGER,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+
+    PRIMARY KEY (model, sha)
+);
+
+-- Fuzzy lookups scan only the cached texts of one issue
+CREATE INDEX IF NOT EXISTS emb_cache_issue_idx
+ON emb_cache (model, repo_name, issue_number);
@@ -0,0 +1,132 @@
+"""Shared fixtures: an in-memory stand-in for the PostgreSQL tables the scripts use"""
+
+import numpy as np
+import psycopg
+import pytest
+
+from scripts import memory_manager
+
+
+def hamming(a: int, b: int) -> int:
+    """Bit distance between two signed 64-bit SimHashes"""
+    return bin((a ^ b) & (2**64 - 1)).count("1")
+
+
+class Rows(list):
+    """Query result usable both as an iterator and through fetchall()"""
+
+    def fetchall(self):
+        return self
+
+
+class FakeConnection:
+    """
+    In-memory issue_embeddings and emb_cache tables.
+
+    Answers the queries issued by iter_embedding_chunks, cached_embeddings
+    and minhash_filter.load_lsh, and records every query with its params.
+    """
+
+    def __init__(self, issues):
+        self.issues = [
+            {"id": row_id, "repo_name": "o/r", "title": "", "body": "", **issue}
+            for row_id, issue in enumerate(issues, start=1)
+        ]
+        self.cache = []
+        self.queries = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def cursor(self):
+        return self
+
+    def execute(self, query, params):
+        self.queries.append((query, params))
+
+        if "FROM issue_embeddings" in query and "id > %s" in query:
+            repo_name, last_id, limit = params
+            return Rows([
+                (row["id"], row["issue_number"], row["embedding"]) for row in self.issues
+                if row["repo_name"] == repo_name and row["id"] > last_id
+            ][:limit])
+
+        if "FROM issue_embeddings" in query:
+            repo_name, indexed = params
+            return Rows(
+                (row["issue_number"], row["title"], row["body"]) for row in self.issues
+                if row["repo_name"] == repo_name and row["issue_number"] not in indexed
+            )
+
+        if "sha = ANY" in query:
+            model, shas = params
+            return Rows(
+                (row["sha"], row["embedding"]) for row in self.cache
+                if row["model"] == model and row["sha"] in shas
+            )
+
+        if "JOIN emb_cache" in query:
+            numbers, simhashes, model, repo_name, max_distance = params
+            result = Rows()
+            for idx, (number, simhash) in enumerate(zip(numbers, simhashes), start=1):
+                candidates = [
+                    (hamming(row["simhash"], simhash), row["embedding"]) for row in self.cache
+                    if (row["model"], row["repo_name"], row["issue_number"])
+                    == (model, repo_name, number)
+                    and hamming(row["simhash"], simhash) <= max_distance
+                ]
+                if candidates:
+                    result.append((idx, min(candidates, key=lambda c: c[0])[1]))
+            return result
+
+        raise AssertionError(f"Unexpected query: {query}")
+
+    def executemany(self, query, rows):
+        keys = ("model", "sha", "simhash", "embedding", "repo_name", "issue_number")
+        for values in rows:
+            row = dict(zip(keys, values))
+            if not any((r["model"], r["sha"]) == (row["model"], row["sha"]) for r in self.cache):
+                self.cache.append(row)
+
+
+@pytest.fixture
+def simhash_distance():
+    """hamming, for tests asserting how far apart two texts' SimHashes are"""
+    return hamming
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    """
+    Route psycopg.connect to a FakeConnection.
+
+    Call with issue_embeddings rows as dicts (issue_number plus any of
+    repo_name, title, body, embedding); returns the connection.
+    """
+    def install(issues=()):
+        conn = FakeConnection(issues)
+        monkeypatch.setattr(psycopg, "connect", lambda url: conn)
+        monkeypatch.setattr(memory_manager, "register_vector", lambda conn: None)
+        return conn
+    return install
+
+
+@pytest.fixture
+def emb_cache(fake_db, monkeypatch):
+    """A loaded model that records what it embeds, over an empty emb_cache"""
+    conn = fake_db()
+    conn.embedded = []
+    monkeypatch.setattr(memory_manager, "_MODEL", object())
+
+    def fake_generate(texts, batch_size):
+        conn.embedded.extend(texts)
+        rng = np.random.default_rng(len(conn.embedded))
+        return memory_manager.normalize(
+            rng.standard_normal((len(texts), memory_manager.EMBEDDING_DIM))
+        )
+
+    monkeypatch.setattr(memory_manager, "generate_embeddings", fake_generate)
+    return conn
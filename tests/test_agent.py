@@ -0,0 +1,156 @@
+"""Tests for agent.py"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+import agent
+from scripts import memory_manager, minhash_filter
+
+
+@pytest.fixture
+def bulk_memory(monkeypatch, tmp_path, fake_db):
+    """Stub out the database side of check_memory_bulk"""
+    def install(issue_embeddings, stored_numbers, stored_embeddings):
+        monkeypatch.setattr(agent, "_DB_URL", "postgres://")
+        monkeypatch.setattr(minhash_filter, "LSH_DIR", tmp_path)
+        fake_db()
+        monkeypatch.setattr(
+            memory_manager, "cached_embeddings", lambda url, texts, **kwargs: issue_embeddings
+        )
+        monkeypatch.setattr(
+            memory_manager, "iter_embedding_chunks",
+            lambda url, repo_name: iter([(stored_numbers, stored_embeddings)]),
+        )
+        monkeypatch.setattr(
+            memory_manager, "store_embeddings", lambda url, repo_name, issues, embs: len(issues)
+        )
+    return install
+
+
+def test_check_memory_bulk_only_flags_older_issues(bulk_memory):
+    original = memory_manager.normalize(np.random.default_rng(0).standard_normal((1, 384)))[0]
+    issues = [
+        {"number": 5, "title": "Crash", "body": ""},
+        {"number": 10, "title": "Crash", "body": ""},
+    ]
+    embeddings = np.stack([original, original])
+    # Both issues were stored by an earlier retriage run
+    bulk_memory(embeddings, np.array([5, 10]), embeddings)
+
+    matches = agent.check_memory_bulk("o", "r", issues)
+
+    assert matches[0] == []
+    assert [m["issue_number"] for m in matches[1]] == [5]
+    # Later single-issue runs find both through the MinHash pre-filter
+    assert sorted(minhash_filter.load_lsh("o/r").keys) == [5, 10]
+
+
+class AssistantMessage:
+    content = None
+
+
+class ResultMessage:
+    result = "done"
+
+
+class FakeAgent:
+    """Streams one assistant message, recording console output mid-response"""
+
+    def __init__(self, capsys):
+        self.capsys = capsys
+        self.streamed = ""
+
+    async def query(self, prompt, session_id):
+        await asyncio.sleep(0)  # let the activity writer start waiting on its queue
+
+    async def receive_response(self):
+        yield AssistantMessage()
+        for _ in range(3):
+            await asyncio.sleep(0)
+        self.streamed = self.capsys.readouterr().out
+        yield ResultMessage()
+
+
+def test_run_query_streams_activity_across_event_loops(capsys):
+    # Each asyncio.run has its own loop; the activity queue must not outlive one
+    for _ in range(2):
+        fake = FakeAgent(capsys)
+        result, _ = asyncio.run(
+            agent._run_query(fake, "prompt", agent.print_activity, "s", False)
+        )
+        assert result == "done"
+        assert fake.streamed == "🤖 Analyzing issue...\n"
+
+
+@pytest.fixture
+def fake_retriage(monkeypatch):
+    """Retriage issues 1..n with fake clients; triage returns the client used"""
+    clients = []
+
+    class FakeClient:
+        def __init__(self, options):
+            clients.append(self)
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+    def run(n, failing=()):
+        async def fake_triage(issue_number, agent, **kwargs):
+            if issue_number in failing:
+                raise RuntimeError("stream broke")
+            return agent, []
+
+        issues = [{"number": number, "title": "", "body": ""} for number in range(1, n + 1)]
+        monkeypatch.setattr(agent, "_GH_TOKEN", "token")
+        monkeypatch.setattr(agent, "fetch_open_issues", lambda owner, repo: issues)
+        monkeypatch.setattr(agent, "build_options", lambda mode: None)
+        monkeypatch.setattr(agent, "ClaudeSDKClient", FakeClient)
+        monkeypatch.setattr(agent, "triage_issue", fake_triage)
+        return dict(asyncio.run(
+            agent.retriage_all_open_issues("o", "r", max_concurrency=1, mode="fast")
+        ))
+
+    run.clients = clients
+    return run
+
+
+def test_retriage_reopens_client_after_failure(fake_retriage):
+    results = fake_retriage(3, failing={2})
+
+    assert isinstance(results[2], RuntimeError)
+    # Issue 3 ran on a fresh client, not the one left mid-response by issue 2
+    clients = fake_retriage.clients
+    assert len(clients) == 2
+    assert results[1] is clients[0] and results[3] is clients[1]
+
+
+def test_retriage_caps_issues_per_client(fake_retriage, monkeypatch):
+    monkeypatch.setattr(agent, "MAX_ISSUES_PER_CLIENT", 3)
+
+    results = fake_retriage(7)
+
+    clients = fake_retriage.clients
+    assert len(clients) == 3
+    assert [clients.index(results[number]) for number in range(1, 8)] == [0, 0, 0, 1, 1, 1, 2]
+
+
+def test_retriage_requires_github_token(monkeypatch, capsys):
+    monkeypatch.setattr(agent, "_GH_TOKEN", None)
+    monkeypatch.setattr(agent, "fetch_open_issues", pytest.fail)
+
+    assert asyncio.run(agent.retriage_all_open_issues("o", "r", mode="fast")) == []
+    assert "❌ Set GITHUB_TOKEN in .env" in capsys.readouterr().out
+
+
+def test_retriage_memory_mode_requires_database_url(monkeypatch, capsys):
+    monkeypatch.setattr(agent, "_GH_TOKEN", "token")
+    monkeypatch.setattr(agent, "_DB_URL", None)
+    monkeypatch.setattr(agent, "fetch_open_issues", pytest.fail)
+
+    assert asyncio.run(agent.retriage_all_open_issues("o", "r", mode="memory")) == []
+    assert "❌ Set DATABASE_URL in .env" in capsys.readouterr().out
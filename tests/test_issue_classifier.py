@@ -0,0 +1,58 @@
+"""Tests for scripts/issue_classifier.py"""
+
+import pytest
+
+from scripts import issue_classifier
+from scripts.issue_classifier import LABELS, classify_issue
+
+
+@pytest.fixture(autouse=True, params=["regex", "automaton"])
+def matcher(request, monkeypatch):
+    """Run every test against both keyword matchers"""
+    if request.param == "regex":
+        monkeypatch.setattr(issue_classifier, "_AUTOMATON", None)
+    elif issue_classifier._AUTOMATON is None:
+        pytest.skip("pyahocorasick not installed")
+
+
+def baseline_classify(title: str, body: str = "", min_confidence: float = 0.6) -> dict:
+    """Reference scorer: one substring check per keyword, as originally implemented"""
+    text = f"{title} {body}".lower()
+
+    scores = {}
+    for category, keywords in LABELS.items():
+        score = sum(1 for keyword in keywords if keyword.lower() in text)
+        scores[category] = score / len(keywords) if keywords else 0
+
+    labels = [cat for cat, score in scores.items() if score >= min_confidence]
+    if not labels and scores:
+        max_score = max(scores.values())
+        if max_score > 0:
+            labels = [cat for cat, score in scores.items() if score == max_score]
+
+    return {
+        "labels": labels,
+        "scores": {k: round(v, 2) for k, v in scores.items()},
+        "confidence": round(max(scores.values()) if scores else 0, 2)
+    }
+
+
+@pytest.mark.parametrize("title, body", [
+    ("App crashes on startup", ""),
+    ("App crashes on startup", "Stack trace shows an exception, the build is broken"),
+    ("How do I add docs?", "Why is the README guide so confusing? Please help"),
+    ("Slow performance", "Speed lag - please optimize the crash error bug"),
+    ("CVE in auth", "Security vulnerability: remote exploit"),
+    ("showhow", "readmereadme"),
+    ("SUPPORT FOR DARK MODE", "IMPLEMENT AS AN ENHANCEMENT"),
+    ("Nothing relevant here", ""),
+    ("", ""),
+])
+def test_matches_baseline_scorer(title, body):
+    assert classify_issue(title, body) == baseline_classify(title, body)
+
+
+@pytest.mark.parametrize("text", ["App is ſlow", "ſupport ſecurity", "İmplement it", "ımplement"])
+def test_case_fold_variants_do_not_crash(text):
+    result = classify_issue(text)
+    assert set(result["scores"]) == set(LABELS)
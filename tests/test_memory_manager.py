@@ -0,0 +1,197 @@
+"""Tests for scripts/memory_manager.py"""
+
+import sys
+
+import numpy as np
+import pytest
+from pgvector import HalfVector
+
+from scripts import memory_manager
+from scripts.memory_manager import (
+    EMBEDDING_DIM,
+    find_batch_duplicates,
+    iter_embedding_chunks,
+    normalize,
+    search_chunked,
+)
+
+
+def random_embeddings(n: int, seed: int = 0) -> np.ndarray:
+    return normalize(np.random.default_rng(seed).standard_normal((n, EMBEDDING_DIM)))
+
+
+def stored(embeddings: np.ndarray, first_number: int = 100) -> list[dict]:
+    """issue_embeddings rows numbered from first_number"""
+    return [
+        {"issue_number": first_number + i, "embedding": HalfVector(embedding)}
+        for i, embedding in enumerate(embeddings)
+    ]
+
+
+def test_iter_embedding_chunks_overlaps_and_covers_all_rows(fake_db):
+    embeddings = random_embeddings(23)
+    fake_db(stored(embeddings))
+
+    chunks = list(iter_embedding_chunks("postgres://", "o/r", chunk_size=10, overlap=2))
+
+    assert [list(numbers) for numbers, _ in chunks] == [
+        list(range(100, 110)), list(range(108, 118)), list(range(116, 123)),
+    ]
+    assert all(len(numbers) == len(chunk) for numbers, chunk in chunks)
+    assert np.allclose(np.linalg.norm(chunks[0][1], axis=1), 1.0, atol=1e-3)
+
+
+def test_iter_embedding_chunks_empty_table(fake_db):
+    fake_db([])
+    assert list(iter_embedding_chunks("postgres://", "o/r")) == []
+
+
+def test_iter_embedding_chunks_without_overlap(fake_db):
+    embeddings = random_embeddings(23)
+    fake_db(stored(embeddings))
+
+    chunks = list(iter_embedding_chunks("postgres://", "o/r", chunk_size=10, overlap=0))
+
+    assert np.concatenate([numbers for numbers, _ in chunks]).tolist() == list(range(100, 123))
+
+
+def test_build_index_holds_one_vector_per_stored_issue(fake_db, tmp_path, monkeypatch):
+    if memory_manager.faiss is None:
+        pytest.skip("faiss not installed")
+    monkeypatch.setattr(memory_manager, "INDEX_DIR", tmp_path)
+    embeddings = random_embeddings(3)
+    fake_db(stored(embeddings))
+
+    assert memory_manager.build_index("postgres://", "o/r") == 3
+    index = memory_manager.load_index("o/r")
+
+    assert [m["issue_number"] for m in memory_manager.search_index(index, embeddings[1])] == [101]
+    assert memory_manager.load_index("o/other") is None
+
+
+@pytest.mark.parametrize("use_faiss", [False, True])
+def test_search_chunked_merges_hits_across_chunks(monkeypatch, use_faiss):
+    if use_faiss and memory_manager.faiss is None:
+        pytest.skip("faiss not installed")
+    if not use_faiss:
+        monkeypatch.setattr(memory_manager, "faiss", None)
+
+    corpus = random_embeddings(30)
+    numbers = np.arange(30)
+    # Overlapping chunks: issue 8 and 9 appear in both
+    chunks = [(numbers[:10], corpus[:10]), (numbers[8:], corpus[8:])]
+
+    results = search_chunked(corpus[[3, 9, 25]], chunks, k=2, threshold=0.85)
+
+    assert [[m["issue_number"] for m in r] for r in results] == [[3], [9], [25]]
+
+
+def test_find_batch_duplicates_only_reports_older_issues():
+    base = random_embeddings(2)
+    embeddings = np.stack([base[0], base[1], base[0]])
+
+    results = find_batch_duplicates([7, 8, 12], embeddings)
+
+    assert results[0] == []
+    assert results[1] == []
+    assert [m["issue_number"] for m in results[2]] == [7]
+
+
+BUG_TEMPLATE = """**Describe the bug**
+A clear and concise description of what the bug is.
+
+**To Reproduce**
+Steps to reproduce the behavior:
+1. Go to '...'
+2. Click on '....'
+3. Scroll down to '....'
+4. See error
+
+**Expected behavior**
+A clear and concise description of what you expected to happen.
+
+**Screenshots**
+If applicable, add screenshots to help explain your problem.
+
+**Desktop (please complete the following information):**
+ - OS: [e.g. iOS]
+ - Browser [e.g. chrome, safari]
+ - Version [e.g. 22]
+
+**Additional context**
+Add any other context about the problem here."""
+
+
+def embed_issues(issues: dict[int, str]) -> np.ndarray:
+    return memory_manager.cached_embeddings(
+        "postgres://", list(issues.values()), repo_name="o/r", issue_numbers=list(issues)
+    )
+
+
+def test_cached_embeddings_reuses_exact_text(emb_cache):
+    first = embed_issues({1: "App crashes"})
+    again = memory_manager.cached_embeddings("postgres://", ["App crashes"])
+
+    assert emb_cache.embedded == ["App crashes"]
+    assert np.allclose(first, again, atol=1e-3)
+    assert all(memory_manager.MODEL_NAME in params for _, params in emb_cache.queries)
+
+
+def test_cached_embeddings_reuses_minor_edit_of_same_issue(emb_cache, simhash_distance):
+    original = f"Login crashes {BUG_TEMPLATE}"
+    edited = f"Login crashes {BUG_TEMPLATE} Thanks"
+    simhashes = [memory_manager._simhash(text) for text in (original, edited)]
+    assert simhash_distance(*simhashes) <= 3
+
+    first = embed_issues({1: original})
+    second = embed_issues({1: edited})
+
+    assert emb_cache.embedded == [original]
+    assert np.allclose(first, second, atol=1e-3)
+    # The reused vector is not cached again under the edited text
+    assert len(emb_cache.cache) == 1
+
+
+def test_cached_embeddings_never_reuses_another_issues_vector(emb_cache, simhash_distance):
+    titles = ["Login crashes", "Export fails", "Memory leak", "Wrong timezone"]
+    texts = {n: f"{title} {BUG_TEMPLATE}" for n, title in enumerate(titles, start=1)}
+    # The shared template dominates: unrelated issues look like minor edits by SimHash
+    simhashes = [memory_manager._simhash(text) for text in texts.values()]
+    assert all(simhash_distance(simhashes[0], other) <= 3 for other in simhashes[1:])
+
+    embeddings = embed_issues({1: texts[1]})
+    for number in (2, 3, 4):
+        embeddings = np.vstack([embeddings, embed_issues({number: texts[number]})])
+
+    assert emb_cache.embedded == list(texts.values())
+    similarities = embeddings @ embeddings.T
+    assert (similarities[~np.eye(4, dtype=bool)] < 0.85).all()
+
+
+def test_cached_embeddings_without_issue_skips_fuzzy_lookup(emb_cache):
+    embed_issues({1: f"Login crashes {BUG_TEMPLATE}"})
+    memory_manager.cached_embeddings("postgres://", [f"Login crashes {BUG_TEMPLATE} Thanks"])
+
+    assert len(emb_cache.embedded) == 2
+    assert not any("simhash" in query for query, _ in emb_cache.queries[2:])
+
+
+def test_cached_embeddings_skips_cache_for_fallback_vectors(monkeypatch):
+    monkeypatch.setattr(memory_manager, "_MODEL", None)
+    monkeypatch.setattr(memory_manager.psycopg, "connect", pytest.fail)
+
+    embeddings = memory_manager.cached_embeddings("postgres://", ["some text"])
+
+    assert embeddings.shape == (1, EMBEDDING_DIM)
+
+
+def test_store_without_repo_exits(monkeypatch, capsys):
+    monkeypatch.setattr(sys, "argv", ["memory_manager.py", "store", "1", "Crash", "Trace"])
+    monkeypatch.delenv("GITHUB_OWNER", raising=False)
+    monkeypatch.delenv("GITHUB_REPO", raising=False)
+    monkeypatch.setattr(memory_manager.psycopg, "connect", pytest.fail)
+
+    with pytest.raises(SystemExit):
+        memory_manager.main()
+
+    assert "❌" in capsys.readouterr().out
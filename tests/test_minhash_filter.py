@@ -0,0 +1,68 @@
+"""Tests for scripts/minhash_filter.py"""
+
+import pytest
+
+from scripts import minhash_filter
+from scripts.minhash_filter import check_and_insert, load_lsh, save_lsh
+
+CRASH = "App crashes on startup Stack trace shows a null pointer in the settings loader"
+
+
+@pytest.fixture(autouse=True)
+def lsh_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(minhash_filter, "LSH_DIR", tmp_path)
+    return tmp_path
+
+
+def test_check_only_reports_older_issues():
+    lsh = load_lsh("o/r")
+    assert check_and_insert(lsh, 5, CRASH) == []
+    assert check_and_insert(lsh, 9, CRASH + ".") == [5]
+    # Re-checking the original must not report its copy
+    assert check_and_insert(lsh, 5, CRASH) == []
+
+
+def test_index_persists_between_runs():
+    lsh = load_lsh("o/r")
+    check_and_insert(lsh, 5, CRASH)
+    save_lsh(lsh, "o/r")
+
+    assert check_and_insert(load_lsh("o/r"), 9, CRASH) == [5]
+
+
+def test_repositories_have_separate_indexes():
+    lsh = load_lsh("o/a")
+    check_and_insert(lsh, 5, CRASH)
+    save_lsh(lsh, "o/a")
+
+    assert minhash_filter.lsh_path("o/a") != minhash_filter.lsh_path("o/b")
+    assert check_and_insert(load_lsh("o/b"), 9, CRASH) == []
+
+
+def test_missing_index_is_seeded_from_memory(fake_db):
+    fake_db([
+        {"issue_number": 5, "title": "App crashes on startup", "body": CRASH[23:]},
+        {"issue_number": 6, "title": "Dark mode", "body": None},
+        {"repo_name": "o/other", "issue_number": 7, "title": CRASH},
+    ])
+
+    lsh = load_lsh("o/r", "postgres://")
+
+    assert sorted(lsh.keys) == [5, 6]
+    assert check_and_insert(lsh, 9, CRASH) == [5]
+
+
+def test_existing_index_gets_issues_it_is_missing(fake_db):
+    # Another run stored #7 but its saved index was overwritten by this one's
+    lsh = load_lsh("o/r")
+    check_and_insert(lsh, 5, "Dark mode support for the settings page")
+    save_lsh(lsh, "o/r")
+    conn = fake_db([
+        {"issue_number": 5, "title": "Dark mode", "body": "support for the settings page"},
+        {"issue_number": 7, "title": "App crashes on startup", "body": CRASH[23:]},
+    ])
+
+    lsh = load_lsh("o/r", "postgres://")
+
+    assert conn.queries[-1][1] == ("o/r", [5])
+    assert check_and_insert(lsh, 9, CRASH) == [7]